@@ -39,16 +39,22 @@ class ChatController:
             self._record_user_message(user_input)
 
             try:
-                response = self.model.generate_response(self.conversation_history)
+                # Stream tokens to the console as they arrive instead of waiting
+                # for the complete reply.
+                response = self.view.display_bot_response_stream(
+                    self.model.stream_response(self.conversation_history)
+                )
             except AIEngineError as error:
-                self.view.display_error(str(error))
+                # The console runs locally for the key's owner, so the
+                # upstream detail is shown alongside the message.
+                message = f"{error} {error.detail}" if error.detail else str(error)
+                self.view.display_error(message)
                 # Remove the most recent user message so that a retry does not
                 # duplicate the same prompt in history.
                 self.conversation_history.pop()
                 continue
 
             self._record_bot_message(response)
-            self.view.display_bot_response(response)
 
     # Internal helpers -------------------------------------------------------------
     def _record_user_message(self, message: str) -> None:
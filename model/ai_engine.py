@@ -2,21 +2,49 @@
 
 This module defines the :class:`AIEngine` class, which is responsible for
 communicating with the OpenAI API. It exposes a simple interface that accepts a
-conversation history and returns the assistant's reply. The implementation
-follows the Model component in the Model-View-Controller (MVC) architecture.
+conversation history and returns the assistant's reply, either in one piece or
+as a stream of text deltas. The implementation follows the Model component in the
+Model-View-Controller (MVC) architecture.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-import json
 import os
-from typing import Iterable, MutableMapping, Sequence
+import time
+from typing import Iterable, Iterator, MutableMapping, Optional, Sequence, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from model.response_cache import ResponseCache
+from utils.api_errors import api_error_detail
+
+
+# Responses worth retrying or handing to a fallback model: rate limits and server errors.
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 class AIEngineError(RuntimeError):
-    """Raised when the OpenAI API request fails or returns an invalid response."""
+    """Raised when the OpenAI API request fails or returns an invalid response.
+
+    The message is safe to show to end users. The upstream error body, when there
+    is one, is kept in :attr:`detail` instead because it can echo request data
+    (OpenAI's 401 message includes a partly masked API key).
+    """
+
+    def __init__(self, message: str = "", detail: str = "") -> None:
+        super().__init__(message)
+        self.detail = detail
+
+
+class AIEngineUnavailableError(AIEngineError):
+    """Raised when the OpenAI API is temporarily unavailable (timeouts, rate limits, 5xx)."""
+
+
+class AIEngineTimeoutError(AIEngineUnavailableError):
+    """Raised when the OpenAI API does not answer within the request timeout."""
 
 
 @dataclass(slots=True)
@@ -32,14 +60,60 @@ class AIEngine:
         Base URL for the OpenAI API. Override this if you are using a proxy.
     timeout_seconds:
         Number of seconds to wait before aborting a request.
+    response_cache:
+        Optional cache consulted before each request. Identical requests are
+        answered from it without calling the API.
+    fallback_models:
+        Models tried in order when the primary model stays unavailable after its
+        retries (rate limits, server errors) or times out. Other failures, such as
+        an invalid API key, are raised immediately.
+    deadline_seconds:
+        Optional overall budget for one request across all models. Each attempt's
+        timeout and each retry delay is capped by the time remaining, so a slow
+        primary model cannot use up the time reserved for the fallbacks.
+
+    The engine keeps a single HTTP session for its lifetime so consecutive turns
+    reuse the same keep-alive connection instead of performing a new TCP/TLS
+    handshake per request; share one instance across turns and close it when done.
     """
 
     model_name: str = "gpt-4o-mini"
     api_base_url: str = "https://api.openai.com/v1"
     timeout_seconds: int = 30
+    response_cache: Optional[ResponseCache] = None
+    fallback_models: Tuple[str, ...] = ()
+    deadline_seconds: Optional[float] = None
     _session: requests.Session = field(default_factory=requests.Session, init=False, repr=False)
+    _endpoint: str = field(init=False, repr=False)
+    _managed_retries: bool = field(init=False, repr=False)
+
+    RETRIES_PER_MODEL = 3
+    RETRY_BACKOFF_SECONDS = 0.2
 
-    def generate_response(self, messages: Sequence[MutableMapping[str, str]]) -> str:
+    def __post_init__(self) -> None:
+        # Read timeouts are never retried (``read=False`` re-raises them as
+        # timeouts): the model may still be generating, and re-sending would
+        # multiply the wait.
+        self._managed_retries = self.deadline_seconds is not None or bool(self.fallback_models)
+        if self._managed_retries:
+            # Backoff and Retry-After waits inside urllib3 cannot see the deadline,
+            # so _post_chat_completion does all retrying itself.
+            retry = Retry(total=0, read=False, respect_retry_after_header=False)
+        else:
+            retry = Retry(
+                total=self.RETRIES_PER_MODEL,
+                read=False,
+                backoff_factor=self.RETRY_BACKOFF_SECONDS,
+                status_forcelist=TRANSIENT_STATUS_CODES,
+                allowed_methods=frozenset({"POST"}),
+            )
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        )
+        self._session.headers.update({"Content-Type": "application/json"})
+        self._endpoint = f"{self.api_base_url.rstrip('/')}/chat/completions"
+
+    def generate_response(self, messages: Iterable[MutableMapping[str, str]]) -> str:
         """Send a conversation history to the OpenAI API and return the response.
 
         Parameters
@@ -61,46 +135,215 @@ class AIEngine:
             malformed.
         """
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise AIEngineError(
-                "Missing OPENAI_API_KEY environment variable. Please export your "
-                "OpenAI API key before running the chatbot."
-            )
+        # Lists and tuples are sent as-is; other iterables are materialised once.
+        if not isinstance(messages, (list, tuple)):
+            messages = list(messages)
+        cache_key = self._cache_key(messages)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        endpoint = f"{self.api_base_url.rstrip('/')}/chat/completions"
+        response, answered_by = self._post_chat_completion(messages, stream=False)
+
+        try:
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:  # pragma: no cover - runtime scenario
+            raise AIEngineError("Received an invalid JSON response from the OpenAI API.") from exc
+
+        try:
+            reply = body["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - runtime scenario
+            raise AIEngineError("The OpenAI API returned an unexpected response format.") from exc
+
+        # Replies from a fallback model are not cached under the primary model's key.
+        if cache_key is not None and answered_by == self.model_name:
+            self.response_cache.set(cache_key, reply)
+        return reply
+
+    def stream_response(self, messages: Iterable[MutableMapping[str, str]]) -> Iterator[str]:
+        """Stream the assistant's reply as it is generated.
+
+        Parameters
+        ----------
+        messages:
+            The conversation history, in the same format accepted by
+            :meth:`generate_response`.
+
+        Yields
+        ------
+        str
+            Successive fragments of the reply. Joining them produces the full
+            response text.
+
+        Raises
+        ------
+        AIEngineError
+            If the API key is missing, the request fails, or a streamed event is
+            malformed. The request is only sent once iteration starts.
+        """
+
+        # Lists and tuples are sent as-is; other iterables are materialised once.
+        if not isinstance(messages, (list, tuple)):
+            messages = list(messages)
+        cache_key = self._cache_key(messages)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        response, answered_by = self._post_chat_completion(messages, stream=True)
+        parts = []
+        with response:
+            try:
+                for line in response.iter_lines():
+                    # Server-sent events: payload lines look like ``data: {...}``.
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[len(b"data:") :].strip()
+                    if data == b"[DONE]":
+                        break
+                    try:
+                        delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+                    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError) as exc:
+                        raise AIEngineError(
+                            "The OpenAI API returned an unexpected streaming event."
+                        ) from exc
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except requests.exceptions.RequestException as exc:  # pragma: no cover - runtime scenario
+                raise AIEngineError(
+                    "The connection to the OpenAI API was interrupted while streaming."
+                ) from exc
+
+        # Only complete replies from the primary model are cached; an abandoned
+        # stream never reaches here.
+        if cache_key is not None and answered_by == self.model_name:
+            self.response_cache.set(cache_key, "".join(parts).strip())
+
+    def _cache_key(self, messages: Sequence[MutableMapping[str, str]]) -> Optional[str]:
+        """Return the response cache key for ``messages``, or ``None`` without a cache."""
+
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(self.model_name, messages)
+
+    def _post_chat_completion(
+        self, messages: Sequence[MutableMapping[str, str]], *, stream: bool
+    ) -> Tuple[requests.Response, str]:
+        """Send a chat completion request and return the successful HTTP response.
+
+        The primary model is tried first, then each of :attr:`fallback_models`
+        while the failures are transient and :attr:`deadline_seconds` allows. With
+        either option set, rate limits and server errors are retried here with
+        exponential backoff; a timeout moves straight on to the next model. The
+        name of the model that answered is returned alongside the response.
+        """
+
+        if "Authorization" not in self._session.headers:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise AIEngineError(
+                    "Missing OPENAI_API_KEY environment variable. Please export your "
+                    "OpenAI API key before running the chatbot."
+                )
+            # Read the key once; every later request reuses the session header.
+            self._session.headers["Authorization"] = f"Bearer {api_key}"
+
+        deadline = None
+        if self.deadline_seconds is not None:
+            deadline = time.monotonic() + self.deadline_seconds
+
+        attempts = self.RETRIES_PER_MODEL + 1 if self._managed_retries else 1
+        error: Optional[AIEngineUnavailableError] = None
+        for model_name in (self.model_name, *self.fallback_models):
+            for attempt in range(attempts):
+                if attempt:
+                    delay = self.RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                    if deadline is not None:
+                        delay = min(delay, max(0.0, deadline - time.monotonic()))
+                    time.sleep(delay)
+                timeout: float = self.timeout_seconds
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AIEngineUnavailableError(
+                            "The OpenAI API did not respond within the configured deadline."
+                        ) from error
+                    timeout = min(timeout, remaining)
+                try:
+                    response = self._send_chat_completion(
+                        model_name, messages, stream=stream, timeout=timeout
+                    )
+                except AIEngineTimeoutError as exc:
+                    error = exc
+                    break
+                except AIEngineUnavailableError as exc:
+                    error = exc
+                else:
+                    return response, model_name
+        raise error
+
+    def _send_chat_completion(
+        self,
+        model_name: str,
+        messages: Sequence[MutableMapping[str, str]],
+        *,
+        stream: bool,
+        timeout: float,
+    ) -> requests.Response:
+        """Send a single chat completion request to ``model_name``."""
+
+        # ``messages`` is a list or tuple and is serialised as-is; the caller's
+        # history is not copied on every turn.
         payload = {
-            "model": self.model_name,
-            "messages": list(messages),
-        }
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
+            "model": model_name,
+            "messages": messages,
         }
+        if stream:
+            payload["stream"] = True
 
         try:
             response = self._session.post(
-                endpoint, data=json.dumps(payload), headers=headers, timeout=self.timeout_seconds
+                self._endpoint,
+                data=orjson.dumps(payload),
+                timeout=timeout,
+                stream=stream,
             )
             response.raise_for_status()
         except requests.exceptions.Timeout as exc:  # pragma: no cover - runtime scenario
-            raise AIEngineError(
+            raise AIEngineTimeoutError(
                 "Timed out while waiting for the OpenAI API. Please try again later."
             ) from exc
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.RetryError,
+        ) as exc:  # pragma: no cover - runtime scenario
+            raise AIEngineUnavailableError(
+                "The OpenAI API is currently unavailable. Please try again later."
+            ) from exc
+        except requests.exceptions.HTTPError as exc:  # pragma: no cover - runtime scenario
+            status = exc.response.status_code if exc.response is not None else None
+            detail = api_error_detail(exc.response)
+            if status in TRANSIENT_STATUS_CODES:
+                raise AIEngineUnavailableError(
+                    f"The OpenAI API is currently unavailable (HTTP {status}). "
+                    "Please try again later.",
+                    detail,
+                ) from exc
+            raise AIEngineError(
+                "An error occurred while communicating with the OpenAI API"
+                + (f" (HTTP {status})." if status is not None else "."),
+                detail,
+            ) from exc
         except requests.exceptions.RequestException as exc:  # pragma: no cover - runtime scenario
             raise AIEngineError(
                 "An error occurred while communicating with the OpenAI API."
             ) from exc
 
-        try:
-            body = response.json()
-        except json.JSONDecodeError as exc:  # pragma: no cover - runtime scenario
-            raise AIEngineError("Received an invalid JSON response from the OpenAI API.") from exc
-
-        try:
-            return body["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - runtime scenario
-            raise AIEngineError("The OpenAI API returned an unexpected response format.") from exc
+        return response
 
     def close(self) -> None:
         """Release any HTTP resources held by the internal session."""
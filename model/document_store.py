@@ -2,16 +2,46 @@
 
 from __future__ import annotations
 
-import json
-import math
+import functools
+import hashlib
 import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, MutableMapping, Optional, Sequence, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import uuid4
 
+import numpy as np
+import orjson
 import requests
-from pypdf import PdfReader
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from model.rate_limit import TokenBucket
+from utils.api_errors import api_error_detail
+
+try:  # Optional dependency used for approximate nearest-neighbour search on large indexes.
+    import hnswlib
+except ImportError:  # pragma: no cover - depends on the environment
+    hnswlib = None
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from pypdf import PdfReader
 
 
 class DocumentStoreError(RuntimeError):
@@ -22,6 +52,11 @@ class EmbeddingClientError(RuntimeError):
     """Raised when requesting embeddings from the OpenAI API fails."""
 
 
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+_WORD_RE = re.compile(r"\S+")
+
+
 @dataclass(slots=True)
 class DocumentMeta:
     """Metadata describing an ingested document."""
@@ -34,14 +69,17 @@ class DocumentMeta:
 
 @dataclass(slots=True)
 class DocumentChunk:
-    """Represents a chunk of a document along with its embedding."""
+    """Represents a chunk of a document.
+
+    The chunk's embedding is not stored on the object; it lives in the matching row
+    of :class:`DocumentStore`'s embedding matrix.
+    """
 
     chunk_id: str
     document_id: str
     document_title: str
     index: int
     text: str
-    embedding: List[float]
 
     def to_dict(self) -> MutableMapping[str, object]:
         """Convert the chunk to a JSON-serialisable mapping."""
@@ -52,7 +90,6 @@ class DocumentChunk:
             "document_title": self.document_title,
             "index": self.index,
             "text": self.text,
-            "embedding": self.embedding,
         }
 
     @classmethod
@@ -65,55 +102,151 @@ class DocumentChunk:
             document_title=str(payload.get("document_title")),
             index=int(payload.get("index", 0)),
             text=str(payload.get("text", "")),
-            embedding=[float(value) for value in payload.get("embedding", [])],
         )
 
 
 @dataclass(slots=True)
 class EmbeddingClient:
-    """Lightweight wrapper around OpenAI's Embeddings endpoint."""
+    """Lightweight wrapper around OpenAI's Embeddings endpoint.
+
+    Embeddings are memoised in a SQLite database at ``cache_path`` keyed by a hash of
+    the model name and input text, so re-ingesting a document or repeating a query
+    only calls the API for texts that have not been embedded before. Set
+    ``cache_path`` to ``None`` to disable the cache. Single queries are additionally
+    memoised in memory by :meth:`embed_query`.
+
+    When ``rate_limiter`` is given, every request first takes its estimated token
+    count from the bucket, so concurrent batches are paced client-side instead of
+    being rejected with HTTP 429.
+
+    ``retry`` replaces the adapter's default policy, which retries transient
+    failures (including read timeouts and ``Retry-After`` waits) up to five times.
+    Latency-sensitive callers pass a stricter policy together with a short
+    ``timeout_seconds``.
+    """
 
     model_name: str = "text-embedding-3-small"
     api_base_url: str = "https://api.openai.com/v1"
-    timeout_seconds: int = 30
+    timeout_seconds: float = 30
+    cache_path: Optional[Path] = field(default_factory=lambda: DATA_DIR / "embedding_cache.sqlite")
+    rate_limiter: Optional[TokenBucket] = None
+    retry: Optional[Retry] = None
     _session: requests.Session = field(default_factory=requests.Session, init=False, repr=False)
+    _endpoint: str = field(init=False, repr=False)
+    _cache: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False)
+    _cache_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _query_cache: Callable[[str, str], Tuple[float, ...]] = field(init=False, repr=False)
 
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
-        """Return OpenAI embeddings for a batch of texts."""
+    # Stay well below SQLite's bound-parameter limit when looking up large batches.
+    _CACHE_LOOKUP_BATCH = 500
+    QUERY_CACHE_SIZE = 1024
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise EmbeddingClientError(
-                "Missing OPENAI_API_KEY environment variable. Please export your OpenAI API key "
-                "before ingesting lecture documents."
+    def __post_init__(self) -> None:
+        # Keep enough pooled connections for concurrent batch requests and retry
+        # transient failures (rate limits, gateway errors) on the same connection pool.
+        if self.retry is None:
+            self.retry = Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
             )
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=self.retry)
+        )
+        self._session.headers.update({"Content-Type": "application/json"})
+        self._endpoint = f"{self.api_base_url.rstrip('/')}/embeddings"
+        self._query_cache = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._embed_one)
+
+    def embed_query(self, text: str) -> Tuple[float, ...]:
+        """Return the embedding for a single query, memoised in an in-process LRU cache."""
+
+        return self._query_cache(self.model_name, text)
+
+    def _embed_one(self, _model_name: str, text: str) -> Tuple[float, ...]:
+        # The model name is part of the LRU key so changing it never serves stale vectors.
+        return tuple(self.embed([text])[0])
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Return OpenAI embeddings for a batch of texts, serving cached vectors first."""
+
+        texts = list(texts)
+        if self.cache_path is None or not texts:
+            return self._request_embeddings(texts)
+
+        keys = [self._cache_key(text) for text in texts]
+        cached = self._cache_lookup(set(keys))
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            fetched = self._request_embeddings(list(missing.values()))
+            if len(fetched) != len(missing):
+                raise EmbeddingClientError(
+                    "The OpenAI API returned an unexpected number of embeddings."
+                )
+            new_entries = dict(zip(missing, fetched))
+            self._cache_store(new_entries)
+            cached.update(new_entries)
+
+        return [cached[key] for key in keys]
+
+    # ------------------------------------------------------------------ HTTP
+    def _request_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        """Request embeddings for ``texts`` directly from the OpenAI API."""
+
+        if not texts:
+            return []
+
+        if "Authorization" not in self._session.headers:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise EmbeddingClientError(
+                    "Missing OPENAI_API_KEY environment variable. Please export your OpenAI API key "
+                    "before ingesting lecture documents."
+                )
+            self._session.headers["Authorization"] = f"Bearer {api_key}"
 
-        endpoint = f"{self.api_base_url.rstrip('/')}/embeddings"
         payload = {"model": self.model_name, "input": list(texts)}
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+
+        # Roughly four characters per token; corrected below from the reported usage.
+        estimated_tokens = sum(len(text) for text in texts) // 4 + len(texts)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(estimated_tokens)
 
         try:
             response = self._session.post(
-                endpoint, json=payload, headers=headers, timeout=self.timeout_seconds
+                self._endpoint, data=orjson.dumps(payload), timeout=self.timeout_seconds
             )
             response.raise_for_status()
         except requests.exceptions.Timeout as exc:  # pragma: no cover - runtime scenario
             raise EmbeddingClientError(
                 "Timed out while waiting for the OpenAI embeddings API. Please try again later."
             ) from exc
+        except requests.exceptions.HTTPError as exc:  # pragma: no cover - runtime scenario
+            raise EmbeddingClientError(
+                "An error occurred while communicating with the OpenAI embeddings API "
+                f"({api_error_detail(exc.response)})."
+            ) from exc
         except requests.exceptions.RequestException as exc:  # pragma: no cover - runtime scenario
             raise EmbeddingClientError(
                 "An error occurred while communicating with the OpenAI embeddings API."
             ) from exc
 
         try:
-            body = response.json()
-        except json.JSONDecodeError as exc:  # pragma: no cover - runtime scenario
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:  # pragma: no cover - runtime scenario
             raise EmbeddingClientError("Received an invalid JSON response from the OpenAI API.") from exc
 
+        usage = body.get("usage")
+        if self.rate_limiter is not None and isinstance(usage, MutableMapping):
+            total_tokens = usage.get("total_tokens")
+            if isinstance(total_tokens, int):
+                self.rate_limiter.adjust(total_tokens - estimated_tokens)
+
         data = body.get("data")
         if not isinstance(data, list):
             raise EmbeddingClientError("The OpenAI API returned an unexpected response format.")
@@ -129,10 +262,63 @@ class EmbeddingClient:
 
         return embeddings
 
+    # ----------------------------------------------------------------- Cache
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+    def _cache_connection(self) -> sqlite3.Connection:
+        """Open (and create if needed) the SQLite embedding cache on first use."""
+
+        if self._cache is None:
+            assert self.cache_path is not None
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+                )
+            except (OSError, sqlite3.Error) as exc:
+                raise EmbeddingClientError(
+                    f"Failed to open the embedding cache at {self.cache_path}."
+                ) from exc
+            self._cache = connection
+        return self._cache
+
+    def _cache_lookup(self, keys: Iterable[str]) -> dict[str, List[float]]:
+        keys = list(keys)
+        found: dict[str, List[float]] = {}
+        with self._cache_lock:
+            connection = self._cache_connection()
+            for start in range(0, len(keys), self._CACHE_LOOKUP_BATCH):
+                batch = keys[start : start + self._CACHE_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _cache_store(self, entries: MutableMapping[str, List[float]]) -> None:
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in entries.items()
+        ]
+        with self._cache_lock:
+            connection = self._cache_connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+                )
+
     def close(self) -> None:
-        """Close the underlying HTTP session."""
+        """Close the underlying HTTP session and the embedding cache."""
 
         self._session.close()
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
 
     def __enter__(self) -> "EmbeddingClient":  # pragma: no cover - convenience wrapper
         return self
@@ -143,41 +329,270 @@ class EmbeddingClient:
 
 @dataclass(slots=True)
 class DocumentStore:
-    """Persist embeddings for lecture documents and provide retrieval capabilities."""
+    """Persist embeddings for lecture documents and provide retrieval capabilities.
+
+    The index is split across append-only files next to ``index_path``: chunk
+    metadata is written one JSON object per line to :attr:`chunks_path` and the
+    embeddings to a raw int8 sidecar (:attr:`embeddings_path`), while
+    ``index_path`` itself is a small JSON header recording how many rows are valid
+    and which generation of the data files they belong to. Ingesting new documents
+    appends to both files; replacing an existing document writes a new generation
+    alongside the old one, which is only removed after the header points at the
+    new files. Each sidecar row is an L2-normalised embedding scaled
+    by :attr:`QUANTIZATION_SCALE` and rounded to int8, so it is memory-mapped on
+    load and used for search as-is without any parsing, at a quarter of the size
+    of float32 storage.
+
+    When :mod:`hnswlib` is installed and the index holds at least
+    :attr:`ANN_MIN_CHUNKS` chunks, searches walk an HNSW graph (persisted at
+    :attr:`ann_index_path`) instead of scoring every chunk. Appended documents are
+    inserted into the existing graph; it is only rebuilt when documents are replaced.
+    The graph keeps its own float32 copy of every vector, both in memory and on
+    disk, so with it the int8 sidecar no longer bounds the index size.
+    """
 
     index_path: Path = field(
-        default_factory=lambda: Path(__file__).resolve().parent.parent / "data" / "document_index.json"
+        default_factory=lambda: DATA_DIR / "document_index.json"
     )
     _chunks: List[DocumentChunk] = field(default_factory=list, init=False, repr=False)
     _model_name: Optional[str] = field(default=None, init=False, repr=False)
+    _matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _ann_index: Optional[Any] = field(default=None, init=False, repr=False)
+    _ann_dirty: bool = field(default=False, init=False, repr=False)
+    # hnswlib does not allow resizing or inserting while a query runs.
+    _ann_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _title_index: dict[str, List[int]] = field(default_factory=dict, init=False, repr=False)
+    _persisted_count: int = field(default=0, init=False, repr=False)
+    # Identifies the data files in use; ``None`` for indexes written before generations.
+    _generation: Optional[str] = field(default=None, init=False, repr=False)
+    _rewrite_required: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    # Inputs per embeddings request when pooling chunks across documents.
+    EMBEDDING_BATCH_SIZE = 256
+    # Below this many chunks a brute-force matrix product is faster than HNSW.
+    ANN_MIN_CHUNKS = 5000
+    # Unit-norm components in [-1, 1] map onto the int8 range [-127, 127].
+    QUANTIZATION_SCALE = 127
+    # Rows dequantised at a time while scoring, bounding the float32 scratch memory.
+    SCORING_BLOCK_ROWS = 2048
+    # Files that make up one generation of index data, next to ``index_path``.
+    DATA_SUFFIXES = (".jsonl", ".i8", ".hnsw")
 
     def __post_init__(self) -> None:
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         if self.index_path.is_file():
             self._load_index()
 
+    @property
+    def chunks_path(self) -> Path:
+        """Location of the JSON Lines file holding chunk metadata."""
+
+        return self._data_path(self._generation, ".jsonl")
+
+    @property
+    def embeddings_path(self) -> Path:
+        """Location of the int8 embedding matrix that accompanies the index."""
+
+        return self._data_path(self._generation, ".i8")
+
+    @property
+    def ann_index_path(self) -> Path:
+        """Location of the persisted HNSW graph used for approximate search."""
+
+        return self._data_path(self._generation, ".hnsw")
+
+    def _data_path(self, generation: Optional[str], suffix: str) -> Path:
+        if generation is None:
+            return self.index_path.with_suffix(suffix)
+        return self.index_path.with_name(f"{self.index_path.stem}.{generation}{suffix}")
+
     # ------------------------------------------------------------------ Persistence
     def _load_index(self) -> None:
         try:
-            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
+            payload = orjson.loads(self.index_path.read_bytes())
+        except orjson.JSONDecodeError as exc:
             raise DocumentStoreError(
                 f"Failed to parse document index at {self.index_path}."
             ) from exc
 
         self._model_name = payload.get("model")
-        chunks_payload = payload.get("chunks", [])
-        if not isinstance(chunks_payload, list):
-            raise DocumentStoreError("Document index is corrupted: expected a list of chunks.")
+        generation = payload.get("generation")
+        if generation is not None and not (isinstance(generation, str) and generation.isalnum()):
+            raise DocumentStoreError("Document index is corrupted: invalid data file generation.")
+        self._generation = generation
+
+        if "chunks" in payload:
+            # Older indexes kept every chunk and its embedding inline in this file;
+            # they are migrated to the append-only layout on the next save.
+            chunks_payload = payload["chunks"]
+            if not isinstance(chunks_payload, list):
+                raise DocumentStoreError("Document index is corrupted: expected a list of chunks.")
+            self._chunks = [DocumentChunk.from_dict(item) for item in chunks_payload]
+            self._matrix = self._inline_matrix(chunks_payload)
+            self._rewrite_required = True
+        else:
+            shape = payload.get("embedding_shape")
+            if shape is not None and not (isinstance(shape, list) and len(shape) == 2):
+                raise DocumentStoreError("Document index is corrupted: invalid embedding shape.")
+            if shape is not None and payload.get("embedding_dtype") != "int8":
+                raise DocumentStoreError("Document index uses an unsupported embedding format.")
+            rows = int(shape[0]) if shape else 0
+            self._chunks = self._load_chunks(rows)
+            self._matrix = self._load_matrix(rows, int(shape[1])) if rows else None
+            self._persisted_count = rows
+
+        self._ann_index = self._load_ann_index(self._matrix)
+        self._title_index = self._build_title_index(self._chunks)
+
+    def _load_chunks(self, rows: int) -> List[DocumentChunk]:
+        """Read the first ``rows`` chunk records from :attr:`chunks_path`."""
+
+        if not rows:
+            return []
 
-        self._chunks = [DocumentChunk.from_dict(item) for item in chunks_payload]
+        chunks: List[DocumentChunk] = []
+        try:
+            with self.chunks_path.open("rb") as handle:
+                for line in handle:
+                    if len(chunks) == rows:
+                        # Records past the header's count come from an interrupted append.
+                        self._rewrite_required = True
+                        break
+                    chunks.append(DocumentChunk.from_dict(orjson.loads(line)))
+        except (OSError, orjson.JSONDecodeError) as exc:
+            raise DocumentStoreError(f"Failed to read document chunks at {self.chunks_path}.") from exc
+
+        if len(chunks) != rows:
+            raise DocumentStoreError(
+                f"Document chunks at {self.chunks_path} do not match the document index."
+            )
+        return chunks
+
+    def _load_matrix(self, rows: int, dimensions: int) -> np.ndarray:
+        """Memory-map the first ``rows`` int8 embeddings from the sidecar file."""
+
+        path = self.embeddings_path
+        expected_bytes = rows * dimensions
+        actual_bytes = path.stat().st_size if path.is_file() else 0
+        if actual_bytes < expected_bytes or not expected_bytes:
+            raise DocumentStoreError(
+                f"Embedding matrix at {path} does not match the document index."
+            )
+        if actual_bytes > expected_bytes:
+            self._rewrite_required = True
+
+        return np.memmap(path, dtype=np.int8, mode="r", shape=(rows, dimensions))
+
+    def _inline_matrix(self, chunks_payload: List[MutableMapping[str, object]]) -> Optional[np.ndarray]:
+        """Build the embedding matrix from embeddings stored inline in the JSON index."""
+
+        if not chunks_payload:
+            return None
+
+        try:
+            matrix = np.asarray(
+                [item.get("embedding", []) for item in chunks_payload], dtype=np.float32
+            )
+        except ValueError as exc:
+            raise DocumentStoreError(
+                "Document index is corrupted: embeddings have inconsistent dimensions."
+            ) from exc
+        if matrix.ndim != 2 or matrix.shape[1] == 0:
+            raise DocumentStoreError("Document index is corrupted: missing chunk embeddings.")
+        return self._quantize_rows(self._normalize_rows(matrix))
 
     def _save_index(self) -> None:
+        matrix = self._matrix
+        previous_generation = self._generation
+        if self._rewrite_required or not self._persisted_count:
+            self._rewrite_data_files()
+        elif len(self._chunks) > self._persisted_count:
+            self._append_data_files(self._persisted_count)
+
+        if self._ann_index is not None:
+            if self._ann_dirty:
+                self._ann_index.save_index(str(self.ann_index_path))
+                self._ann_dirty = False
+        elif self.ann_index_path.is_file():
+            self.ann_index_path.unlink()
+
+        # The header is swapped in last: it only ever counts fully written rows and
+        # names a generation whose data files are complete.
         payload = {
             "model": self._model_name,
-            "chunks": [chunk.to_dict() for chunk in self._chunks],
+            "generation": self._generation,
+            "embedding_shape": list(matrix.shape) if matrix is not None else None,
+            "embedding_dtype": "int8",
         }
-        self.index_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        temporary_index = self.index_path.with_suffix(".json.tmp")
+        temporary_index.write_bytes(orjson.dumps(payload))
+        os.replace(temporary_index, self.index_path)
+        self._persisted_count = len(self._chunks)
+        self._rewrite_required = False
+
+        if self._generation != previous_generation:
+            self._remove_stale_data_files()
+
+    def _rewrite_data_files(self) -> None:
+        """Write the full in-memory index to the data files of a new generation.
+
+        The previous generation is left untouched, so existing memory maps of its
+        matrix stay valid and a crash before the header is replaced leaves the old
+        index intact.
+        """
+
+        self._generation = uuid4().hex
+        with self.chunks_path.open("wb") as handle:
+            handle.writelines(self._chunk_lines(self._chunks))
+        if self._matrix is not None:
+            np.ascontiguousarray(self._matrix, dtype=np.int8).tofile(self.embeddings_path)
+        # The graph is saved under the new generation's name as well.
+        self._ann_dirty = True
+
+    def _remove_stale_data_files(self) -> None:
+        """Delete data files that do not belong to the current generation.
+
+        Only this index's own files are considered: its pre-generation data files and
+        files named ``<stem>.<generation><suffix>``. Sibling indexes whose names
+        share the stem, such as ``lectures.v2.json`` next to ``lectures.json``, are
+        left alone.
+        """
+
+        current = {self._data_path(self._generation, suffix) for suffix in self.DATA_SUFFIXES}
+        stale = [self._data_path(None, suffix) for suffix in self.DATA_SUFFIXES]
+        # Includes files left behind by rewrites that crashed before the header.
+        generation_file = re.compile(
+            rf"{re.escape(self.index_path.stem)}\.[0-9a-f]{{32}}"
+            rf"(?:{'|'.join(re.escape(suffix) for suffix in self.DATA_SUFFIXES)})"
+        )
+        try:
+            siblings = list(self.index_path.parent.iterdir())
+        except OSError:
+            siblings = []
+        stale.extend(path for path in siblings if generation_file.fullmatch(path.name))
+        for path in stale:
+            if path in current:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                # Still mapped elsewhere or already gone; retried after the next rewrite.
+                pass
+
+    def _append_data_files(self, start: int) -> None:
+        """Append chunks and embeddings from row ``start`` onwards to the data files."""
+
+        assert self._matrix is not None
+        with self.chunks_path.open("ab") as handle:
+            handle.writelines(self._chunk_lines(self._chunks[start:]))
+        with self.embeddings_path.open("ab") as handle:
+            np.ascontiguousarray(self._matrix[start:], dtype=np.int8).tofile(handle)
+
+    @staticmethod
+    def _chunk_lines(chunks: Iterable[DocumentChunk]) -> Iterator[bytes]:
+        for chunk in chunks:
+            yield orjson.dumps(chunk.to_dict(), option=orjson.OPT_APPEND_NEWLINE)
 
     # --------------------------------------------------------------------- Ingestion
     def ingest_pdf(
@@ -191,6 +606,170 @@ class DocumentStore:
     ) -> DocumentMeta:
         """Extract text from a PDF, embed it, and persist the resulting chunks."""
 
+        (result,) = self.ingest_pdfs(
+            [pdf_path],
+            embedding_client,
+            titles=[title],
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+        if isinstance(result, DocumentStoreError):
+            raise result
+        return result
+
+    def ingest_pdfs(
+        self,
+        pdf_paths: Sequence[Path],
+        embedding_client: EmbeddingClient,
+        *,
+        titles: Sequence[str | None] | None = None,
+        chunk_size: int = 600,
+        chunk_overlap: int = 120,
+        max_workers: int = 8,
+    ) -> List[DocumentMeta | DocumentStoreError]:
+        """Ingest several PDFs, pooling their chunks into shared embedding requests.
+
+        Text extraction runs on a thread pool, after which the chunks of every
+        document are embedded together in requests of up to
+        :attr:`EMBEDDING_BATCH_SIZE` inputs and the index is written once. The
+        returned list is aligned with ``pdf_paths``: each entry is either the
+        :class:`DocumentMeta` of the ingested document or the
+        :class:`DocumentStoreError` explaining why that file was skipped. When several
+        files share a title, only the last one is stored and the earlier ones are
+        reported as superseded. Embedding failures affect the whole batch and are
+        raised.
+        """
+
+        if titles is None:
+            titles = [None] * len(pdf_paths)
+        if len(titles) != len(pdf_paths):
+            raise ValueError("titles must be aligned with pdf_paths.")
+
+        results: List[DocumentMeta | DocumentStoreError] = []
+        extracted: List[Tuple[int, DocumentMeta, List[str]]] = []
+        pending: List[Tuple[DocumentMeta, int]] = []
+        chunk_texts: List[str] = []
+
+        workers = max(1, min(max_workers, len(pdf_paths)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            extractions = [
+                executor.submit(
+                    self._extract_chunks, path, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+                )
+                for path in pdf_paths
+            ]
+            for pdf_path, title, extraction in zip(pdf_paths, titles, extractions):
+                try:
+                    document_chunks = extraction.result()
+                except DocumentStoreError as error:
+                    results.append(error)
+                    continue
+                meta = DocumentMeta(
+                    document_id=str(uuid4()),
+                    title=title or pdf_path.stem,
+                    source_path=str(pdf_path),
+                    chunk_count=len(document_chunks),
+                )
+                extracted.append((len(results), meta, document_chunks))
+                results.append(meta)
+
+            # A later file with the same title replaces an earlier one from the same
+            # batch; the earlier one is reported as skipped and never embedded.
+            latest = {meta.title: meta for _position, meta, _chunks in extracted}
+            for position, meta, document_chunks in extracted:
+                winner = latest[meta.title]
+                if winner is not meta:
+                    results[position] = DocumentStoreError(
+                        f"Skipped {meta.source_path}: superseded by {winner.source_path}, "
+                        f"which has the same title '{meta.title}'."
+                    )
+                    continue
+                # Remember where this document's chunks start in the pooled batch.
+                pending.append((meta, len(chunk_texts)))
+                chunk_texts.extend(document_chunks)
+
+            if not pending:
+                return results
+
+            batches = [
+                chunk_texts[start : start + self.EMBEDDING_BATCH_SIZE]
+                for start in range(0, len(chunk_texts), self.EMBEDDING_BATCH_SIZE)
+            ]
+            embeddings: List[List[float]] = []
+            for batch, vectors in zip(batches, executor.map(embedding_client.embed, batches)):
+                if len(vectors) != len(batch):
+                    raise DocumentStoreError(
+                        "Embedding API returned an unexpected number of vectors."
+                    )
+                embeddings.extend(vectors)
+
+        new_vectors = self._quantize_rows(
+            self._normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        )
+
+        # Only kept documents were embedded, so rows of ``new_vectors`` line up with
+        # ``new_chunks``.
+        new_chunks: List[DocumentChunk] = []
+        for meta, offset in pending:
+            for index in range(meta.chunk_count):
+                new_chunks.append(
+                    DocumentChunk(
+                        chunk_id=f"{meta.document_id}:{index}",
+                        document_id=meta.document_id,
+                        document_title=meta.title,
+                        index=index,
+                        text=chunk_texts[offset + index],
+                    )
+                )
+
+        with self._lock:
+            # Remove any previously stored chunks with the same title to avoid duplicates.
+            replaced = sorted(
+                position
+                for title in latest
+                for position in self._title_index.get(title, ())
+            )
+            chunks = self._chunks
+            matrix = self._matrix
+            if replaced:
+                keep = np.ones(len(chunks), dtype=bool)
+                keep[replaced] = False
+                chunks = [chunk for chunk, kept in zip(chunks, keep) if kept]
+                matrix = matrix[keep] if matrix is not None and keep.any() else None
+
+            parts = [new_vectors]
+            if matrix is not None:
+                parts.insert(0, matrix)
+            try:
+                matrix = np.concatenate(parts)
+            except ValueError as exc:
+                raise DocumentStoreError(
+                    "New embeddings do not match the dimensions of the existing index."
+                ) from exc
+
+            if replaced:
+                self._rewrite_required = True
+                self._chunks = chunks + new_chunks
+                self._title_index = self._build_title_index(self._chunks)
+                self._ann_index = self._build_ann_index(matrix)
+            else:
+                start = len(chunks)
+                self._chunks = chunks + new_chunks
+                for position, chunk in enumerate(new_chunks, start):
+                    self._title_index.setdefault(chunk.document_title, []).append(position)
+                self._ann_index = self._extend_ann_index(matrix, start)
+            self._matrix = matrix
+            self._model_name = embedding_client.model_name
+            self._save_index()
+
+        return results
+
+    def _extract_chunks(self, pdf_path: Path, *, chunk_size: int, chunk_overlap: int) -> List[str]:
+        """Read ``pdf_path`` and split its text into overlapping word chunks."""
+
+        # Imported here so that chat-only code paths never pay for loading pypdf.
+        from pypdf import PdfReader
+
         if not pdf_path.is_file():
             raise DocumentStoreError(f"Could not find PDF at {pdf_path}.")
 
@@ -199,58 +778,24 @@ class DocumentStore:
         except Exception as exc:  # pragma: no cover - runtime scenario
             raise DocumentStoreError(f"Failed to read PDF file: {pdf_path}.") from exc
 
-        text_sections: List[str] = []
+        # Pages are extracted lazily and fed straight into the chunker, so the full
+        # document text is never held in memory at once.
+        chunks = list(
+            self._split_text(
+                self._page_texts(reader), chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+        )
+        if not chunks:
+            raise DocumentStoreError("The supplied PDF does not contain any extractable text.")
+        return chunks
+
+    @staticmethod
+    def _page_texts(reader: PdfReader) -> Iterator[str]:
         for page in reader.pages:
             try:
-                content = page.extract_text() or ""
+                yield page.extract_text() or ""
             except Exception:  # pragma: no cover - runtime scenario
-                content = ""
-            cleaned = content.strip()
-            if cleaned:
-                text_sections.append(cleaned)
-
-        document_text = "\n\n".join(text_sections)
-        if not document_text.strip():
-            raise DocumentStoreError("The supplied PDF does not contain any extractable text.")
-
-        chunks = self._split_text(document_text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        if not chunks:
-            raise DocumentStoreError("Could not split the PDF into meaningful text chunks.")
-
-        embeddings = embedding_client.embed(chunks)
-        if len(embeddings) != len(chunks):
-            raise DocumentStoreError("Embedding API returned an unexpected number of vectors.")
-
-        document_id = str(uuid4())
-        document_title = title or pdf_path.stem
-
-        # Remove any previously stored chunks with the same title to avoid duplicates.
-        self._chunks = [chunk for chunk in self._chunks if chunk.document_title != document_title]
-
-        new_chunks: List[DocumentChunk] = []
-        for index, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_id = f"{document_id}:{index}"
-            new_chunks.append(
-                DocumentChunk(
-                    chunk_id=chunk_id,
-                    document_id=document_id,
-                    document_title=document_title,
-                    index=index,
-                    text=chunk_text,
-                    embedding=embedding,
-                )
-            )
-
-        self._chunks.extend(new_chunks)
-        self._model_name = embedding_client.model_name
-        self._save_index()
-
-        return DocumentMeta(
-            document_id=document_id,
-            title=document_title,
-            source_path=str(pdf_path),
-            chunk_count=len(new_chunks),
-        )
+                yield ""
 
     # --------------------------------------------------------------------- Retrieval
     def search(
@@ -258,18 +803,50 @@ class DocumentStore:
     ) -> List[Tuple[float, DocumentChunk]]:
         """Return the most relevant document chunks for the given query."""
 
-        if not self._chunks:
+        # Blank queries cannot match anything, so skip the embeddings request entirely.
+        query = query.strip()
+        if not query or top_k <= 0:
             return []
 
-        query_embedding = embedding_client.embed([query])[0]
-        scored_chunks: List[Tuple[float, DocumentChunk]] = []
-        for chunk in self._chunks:
-            score = self._cosine_similarity(query_embedding, chunk.embedding)
-            if score > 0:
-                scored_chunks.append((score, chunk))
+        with self._lock:
+            chunks = self._chunks
+            matrix = self._matrix
+            ann_index = self._ann_index
+        if matrix is None or not chunks:
+            return []
 
-        scored_chunks.sort(key=lambda item: item[0], reverse=True)
-        return scored_chunks[:top_k]
+        query_vector = np.asarray(embedding_client.embed_query(query), dtype=np.float32)
+        if query_vector.ndim != 1 or query_vector.shape[0] != matrix.shape[1]:
+            return []
+
+        query_norm = float(np.linalg.norm(query_vector))
+        if query_norm == 0:
+            return []
+        query_vector /= query_norm
+
+        if ann_index is not None:
+            with self._ann_lock:
+                labels, distances = ann_index.knn_query(query_vector, k=min(top_k, len(chunks)))
+            # hnswlib's cosine distance is ``1 - similarity``. Labels past ``chunks``
+            # belong to rows appended after this search took its snapshot.
+            return [
+                (min(1.0, 1.0 - float(distance)), chunks[int(label)])
+                for label, distance in zip(labels[0], distances[0])
+                if distance < 1.0 and label < len(chunks)
+            ]
+
+        scores = self._score_rows(matrix, query_vector)
+        if top_k < scores.shape[0]:
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(scores.shape[0])
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            (float(scores[position]), chunks[position])
+            for position in ranked
+            if scores[position] > 0
+        ]
 
     def has_content(self) -> bool:
         """Return ``True`` when at least one document chunk is available."""
@@ -277,61 +854,207 @@ class DocumentStore:
         return bool(self._chunks)
 
     @staticmethod
-    def build_system_prompt(chunks: Sequence[DocumentChunk]) -> str:
-        """Create a system prompt that injects lecture context into the chat."""
-
-        intro = (
-            "You are Neuro AI, a helpful study assistant for SLIIT students. Use the "
-            "following lecture excerpts when formulating your answer. If the "
-            "information is not present, acknowledge that you do not know."
+    def build_system_prompt() -> str:
+        """Return the fixed system prompt used whenever the store has content.
+
+        The prompt never changes between turns so it can lead every request and
+        keep the conversation prefix byte-stable for provider-side prompt caching;
+        the retrieved excerpts are supplied separately by
+        :meth:`build_context_prompt`. It must also read correctly on turns where the
+        search found nothing (or failed), so it does not promise that excerpts follow.
+        """
+
+        return (
+            "You are Neuro AI, a helpful study assistant for SLIIT students. If lecture "
+            "excerpts are provided just before a question, use them when formulating "
+            "your answer, and if they do not contain the information, acknowledge that "
+            "you do not know. Without excerpts, answer from your general knowledge. When "
+            "answering, cite the relevant course material when possible and keep the "
+            "focus on SLIIT curricula."
         )
-        sections: List[str] = [intro, "---"]
+
+    @staticmethod
+    def build_context_prompt(chunks: Sequence[DocumentChunk]) -> str:
+        """Format retrieved lecture excerpts for injection before the latest user turn."""
+
+        sections: List[str] = ["Lecture excerpts for the next question:", "---"]
         for chunk in chunks:
             header = f"Source: {chunk.document_title} (section {chunk.index + 1})"
             sections.append(f"{header}\n{chunk.text}")
             sections.append("---")
-        sections.append(
-            "When answering, cite the relevant course material when possible and keep the "
-            "focus on SLIIT curricula."
-        )
         return "\n\n".join(sections)
 
     # ------------------------------------------------------------------ Text helpers
+    @classmethod
+    def _split_text(
+        cls, pages: Iterable[str], *, chunk_size: int, chunk_overlap: int
+    ) -> Iterator[str]:
+        """Yield overlapping chunks of ``chunk_size`` words from a stream of page texts.
+
+        Only the character offsets of the current window of words are kept; after
+        each chunk the last ``chunk_overlap`` words are retained to start the next
+        one. Chunks are sliced straight out of the page text, so the original
+        spacing and line breaks are preserved.
+        """
+
+        retained = min(chunk_overlap, chunk_size - 1)
+        # Each entry is ``(page_number, start, end)`` for one word.
+        window: deque[Tuple[int, int, int]] = deque()
+        page_texts: dict[int, str] = {}
+        has_unemitted_words = False
+        for page_number, page in enumerate(pages):
+            for match in _WORD_RE.finditer(page):
+                if page_number not in page_texts:
+                    page_texts[page_number] = page
+                window.append((page_number, match.start(), match.end()))
+                has_unemitted_words = True
+                if len(window) == chunk_size:
+                    yield cls._window_text(window, page_texts)
+                    has_unemitted_words = False
+                    for _ in range(chunk_size - retained):
+                        window.popleft()
+                    # Forget pages that no longer contribute words to the window.
+                    first_page = window[0][0] if window else page_number
+                    for stale_page in [number for number in page_texts if number < first_page]:
+                        del page_texts[stale_page]
+
+        if has_unemitted_words:
+            yield cls._window_text(window, page_texts)
+
     @staticmethod
-    def _split_text(text: str, *, chunk_size: int, chunk_overlap: int) -> List[str]:
-        words = text.split()
-        if not words:
-            return []
+    def _window_text(window: deque[Tuple[int, int, int]], page_texts: dict[int, str]) -> str:
+        """Slice the text spanned by ``window`` out of the buffered pages."""
+
+        first_page, start, _ = window[0]
+        last_page, _, end = window[-1]
+        if first_page == last_page:
+            return page_texts[first_page][start:end]
+
+        sections = [page_texts[first_page][start:].rstrip()]
+        sections.extend(
+            page_texts[number].strip()
+            for number in range(first_page + 1, last_page)
+            if number in page_texts
+        )
+        sections.append(page_texts[last_page][:end].lstrip())
+        return "\n\n".join(sections)
 
-        chunks: List[str] = []
-        start = 0
-        total_words = len(words)
-        while start < total_words:
-            end = min(start + chunk_size, total_words)
-            chunk_words = words[start:end]
-            chunk_text = " ".join(chunk_words).strip()
-            if chunk_text:
-                chunks.append(chunk_text)
-            if end == total_words:
-                break
-            start = max(0, end - chunk_overlap)
-            if start >= total_words:
-                break
-        return chunks
+    @staticmethod
+    def _build_title_index(chunks: Sequence[DocumentChunk]) -> dict[str, List[int]]:
+        """Map each document title to the positions of its chunks."""
+
+        title_index: dict[str, List[int]] = {}
+        for position, chunk in enumerate(chunks):
+            title_index.setdefault(chunk.document_title, []).append(position)
+        return title_index
+
+    # ------------------------------------------------------------ Vector helpers
+    def _build_ann_index(self, matrix: Optional[np.ndarray]) -> Optional[Any]:
+        """Build an HNSW index over ``matrix`` when it is large enough to benefit."""
+
+        if hnswlib is None or matrix is None or matrix.shape[0] < self.ANN_MIN_CHUNKS:
+            return None
+
+        rows, dimensions = matrix.shape
+        ann_index = hnswlib.Index(space="cosine", dim=dimensions)
+        ann_index.init_index(max_elements=rows, ef_construction=200, M=16)
+        self._add_ann_rows(ann_index, matrix, 0)
+        ann_index.set_ef(64)
+        self._ann_dirty = True
+        return ann_index
+
+    def _extend_ann_index(self, matrix: np.ndarray, start: int) -> Optional[Any]:
+        """Insert rows ``start:`` of ``matrix`` into the current HNSW index.
+
+        Only the new rows are added to the graph; capacity grows geometrically so
+        repeated appends rarely trigger a resize. Falls back to a full build when
+        there is no index yet (e.g. the store just crossed :attr:`ANN_MIN_CHUNKS`).
+        """
+
+        ann_index = self._ann_index
+        if ann_index is None:
+            return self._build_ann_index(matrix)
+
+        rows = matrix.shape[0]
+        with self._ann_lock:
+            capacity = ann_index.get_max_elements()
+            if rows > capacity:
+                ann_index.resize_index(max(rows, 2 * capacity))
+            self._add_ann_rows(ann_index, matrix, start)
+        self._ann_dirty = True
+        return ann_index
+
+    @classmethod
+    def _add_ann_rows(cls, ann_index: Any, matrix: np.ndarray, start: int) -> None:
+        """Insert rows ``start:`` of the int8 ``matrix`` into ``ann_index``.
+
+        Rows are converted to float32 in blocks of :attr:`SCORING_BLOCK_ROWS`, so
+        the scratch memory stays bounded on top of the copy hnswlib keeps itself.
+        """
+
+        # hnswlib normalises vectors for the cosine space, so the int8 scale cancels out.
+        for offset in range(start, matrix.shape[0], cls.SCORING_BLOCK_ROWS):
+            block = matrix[offset : offset + cls.SCORING_BLOCK_ROWS]
+            ann_index.add_items(
+                block.astype(np.float32), np.arange(offset, offset + len(block))
+            )
+
+    def _load_ann_index(self, matrix: Optional[np.ndarray]) -> Optional[Any]:
+        """Load the persisted HNSW index, rebuilding it if it is missing or stale."""
+
+        if hnswlib is None or matrix is None or matrix.shape[0] < self.ANN_MIN_CHUNKS:
+            return None
+
+        if self.ann_index_path.is_file():
+            rows, dimensions = matrix.shape
+            ann_index = hnswlib.Index(space="cosine", dim=dimensions)
+            try:
+                ann_index.load_index(str(self.ann_index_path), max_elements=rows)
+            except RuntimeError:
+                pass
+            else:
+                if ann_index.get_current_count() == rows:
+                    ann_index.set_ef(64)
+                    self._ann_dirty = False
+                    return ann_index
+
+        return self._build_ann_index(matrix)
 
     @staticmethod
-    def _cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
-        if not left or not right:
-            return 0.0
-        if len(left) != len(right):
-            return 0.0
-
-        dot = sum(a * b for a, b in zip(left, right))
-        norm_left = math.sqrt(sum(value * value for value in left))
-        norm_right = math.sqrt(sum(value * value for value in right))
-        if norm_left == 0 or norm_right == 0:
-            return 0.0
-        return dot / (norm_left * norm_right)
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalise the rows of ``matrix`` in place and return it."""
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # Zero vectors stay zero (and therefore never score above 0) instead of becoming NaN.
+        matrix /= np.where(norms == 0, 1.0, norms)
+        return matrix
+
+    @classmethod
+    def _quantize_rows(cls, matrix: np.ndarray) -> np.ndarray:
+        """Quantise an L2-normalised float matrix to int8."""
+
+        scaled = np.clip(np.rint(matrix * cls.QUANTIZATION_SCALE), -127, 127)
+        return scaled.astype(np.int8)
+
+    @classmethod
+    def _score_rows(cls, matrix: np.ndarray, query_vector: np.ndarray) -> np.ndarray:
+        """Return cosine similarities between the int8 ``matrix`` rows and a unit query.
+
+        Rows are converted to float32 in blocks so the product still runs through
+        BLAS while the scratch memory stays bounded regardless of the index size.
+        """
+
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], cls.SCORING_BLOCK_ROWS):
+            block = matrix[start : start + cls.SCORING_BLOCK_ROWS].astype(np.float32)
+            out = scores[start : start + len(block)]
+            np.matmul(block, query_vector, out=out)
+            # Rounding leaves quantised rows slightly off unit norm, so divide by each
+            # row's own norm rather than the nominal scale; zero rows score 0.
+            norms = np.linalg.norm(block, axis=1)
+            np.divide(out, norms, out=out, where=norms > 0)
+            out[norms == 0] = 0.0
+        return np.clip(scores, -1.0, 1.0, out=scores)
 
 
 __all__ = [
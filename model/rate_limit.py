@@ -0,0 +1,85 @@
+"""Client-side rate limiting for OpenAI API requests.
+
+Ingestion sends several embedding requests concurrently. Without pacing, large
+batches run straight into the account's tokens-per-minute limit and spend their
+time in 429 retries. A shared :class:`TokenBucket` spreads the requests out so
+they stay under the limit instead.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Optional
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate_per_minute``.
+
+    Parameters
+    ----------
+    rate_per_minute:
+        Number of tokens added to the bucket per minute.
+    burst:
+        Maximum number of tokens the bucket can hold. Defaults to
+        ``rate_per_minute``, allowing one minute's worth of requests at once.
+    """
+
+    rate_per_minute: float
+    burst: Optional[float] = None
+    _tokens: float = field(init=False, repr=False)
+    _updated_at: float = field(init=False, repr=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        if self.burst is None:
+            self.burst = self.rate_per_minute
+        if self.burst <= 0:
+            raise ValueError("burst must be positive.")
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` are available, then take them from the bucket.
+
+        Requests larger than :attr:`burst` wait for a full bucket rather than
+        forever, but are still charged in full: the balance goes negative and later
+        callers wait until the excess has been paid back.
+        """
+
+        required = min(tokens, self.burst)
+        with self._condition:
+            while True:
+                self._refill()
+                if self._tokens >= required:
+                    self._tokens -= tokens
+                    return
+                shortfall = required - self._tokens
+                self._condition.wait(shortfall * 60.0 / self.rate_per_minute)
+
+    def adjust(self, tokens: float) -> None:
+        """Charge (positive) or refund (negative) ``tokens`` without blocking.
+
+        Used to correct an estimate once the real usage of a request is known. The
+        balance may go negative, in which case later callers wait for it to recover.
+        """
+
+        with self._condition:
+            self._refill()
+            self._tokens = min(self.burst, self._tokens - tokens)
+            if tokens < 0:
+                self._condition.notify_all()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_minute / 60.0)
+
+
+__all__ = ["TokenBucket"]
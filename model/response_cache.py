@@ -0,0 +1,147 @@
+"""Client-side cache for chat completion responses.
+
+Identical requests (same model and the exact same message history) are answered
+from the cache instead of calling the OpenAI API again. Entries are keyed by a
+SHA-256 digest of the canonical request and can live in memory or in a SQLite
+file so they survive restarts.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Iterable, MutableMapping, Optional, Tuple
+
+import orjson
+
+
+class ResponseCacheError(RuntimeError):
+    """Raised when the response cache cannot be opened or queried."""
+
+
+@dataclass(slots=True)
+class ResponseCache:
+    """Memoise chat responses by a hash of the request that produced them.
+
+    Parameters
+    ----------
+    backend:
+        ``"memory"`` for a bounded in-process LRU, or ``"sqlite"`` to persist
+        entries in ``path``.
+    ttl_seconds:
+        How long an entry stays valid. ``None`` keeps entries until evicted.
+    path:
+        Location of the SQLite database when ``backend`` is ``"sqlite"``.
+    max_entries:
+        Maximum number of entries retained by the in-memory backend.
+    """
+
+    backend: str = "memory"
+    ttl_seconds: Optional[float] = 3600.0
+    path: Path = field(
+        default_factory=lambda: Path(__file__).resolve().parent.parent / "data" / "response_cache.sqlite"
+    )
+    max_entries: int = 1024
+    _entries: "OrderedDict[str, Tuple[Optional[float], str]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _connection: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.backend not in {"memory", "sqlite"}:
+            raise ValueError(f"Unknown response cache backend: {self.backend!r}.")
+
+    @staticmethod
+    def make_key(model_name: str, messages: Iterable[MutableMapping[str, str]]) -> str:
+        """Return the SHA-256 digest identifying a chat completion request."""
+
+        if not isinstance(messages, (list, tuple)):
+            messages = list(messages)
+        canonical = orjson.dumps(
+            {"model": model_name, "messages": messages}, option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(canonical).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or ``None`` if absent or expired."""
+
+        now = time.time()
+        with self._lock:
+            if self.backend == "memory":
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+                expires_at, value = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._entries[key]
+                    return None
+                self._entries.move_to_end(key)
+                return value
+
+            row = self._sqlite().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` as the response for ``key``."""
+
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            if self.backend == "memory":
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                return
+
+            connection = self._sqlite()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+
+    def close(self) -> None:
+        """Close the SQLite connection, if one was opened."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _sqlite(self) -> sqlite3.Connection:
+        """Open (and create if needed) the SQLite database on first use."""
+
+        if self._connection is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.path), check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+                )
+                # Drop expired rows once per process rather than on every lookup.
+                with connection:
+                    connection.execute(
+                        "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                        (time.time(),),
+                    )
+            except (OSError, sqlite3.Error) as exc:
+                raise ResponseCacheError(f"Failed to open the response cache at {self.path}.") from exc
+            self._connection = connection
+        return self._connection
+
+
+__all__ = ["ResponseCache", "ResponseCacheError"]
@@ -4,14 +4,9 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import NoReturn
+from typing import List, NoReturn, Sequence
 
-from model.document_store import (
-    DocumentStore,
-    DocumentStoreError,
-    EmbeddingClient,
-    EmbeddingClientError,
-)
+from utils.env import load_environment_from_file
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -19,13 +14,18 @@ def build_parser() -> argparse.ArgumentParser:
 
     parser = argparse.ArgumentParser(
         description=(
-            "Ingest a lecture PDF so Neuro AI can use it for personalised, context-aware responses."
+            "Ingest lecture PDFs so Neuro AI can use them for personalised, context-aware responses."
         )
     )
-    parser.add_argument("pdf", type=Path, help="Path to the lecture PDF to ingest.")
+    parser.add_argument(
+        "pdf",
+        type=Path,
+        nargs="+",
+        help="Lecture PDFs to ingest, or directories containing them.",
+    )
     parser.add_argument(
         "--title",
-        help="Optional override for the document title stored in the index.",
+        help="Optional override for the document title stored in the index (single PDF only).",
     )
     parser.add_argument(
         "--index",
@@ -33,27 +33,82 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Custom path to the document index JSON file (defaults to data/document_index.json).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of PDFs to read concurrently (defaults to 8).",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=int,
+        default=None,
+        help="Pace embedding requests to stay under this OpenAI tokens-per-minute limit.",
+    )
     return parser
 
 
+def collect_pdfs(paths: Sequence[Path]) -> List[Path]:
+    """Expand directories into the PDFs they contain, preserving the given order."""
+
+    pdfs: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            pdfs.extend(sorted(child for child in path.glob("*.pdf") if child.is_file()))
+        else:
+            pdfs.append(path)
+    return pdfs
+
+
 def ingest(args: argparse.Namespace) -> int:
-    """Ingest the requested PDF and return an exit status code."""
+    """Ingest the requested PDFs and return an exit status code."""
+
+    # Imported here so ``--help`` and argument errors do not pay for NumPy/requests.
+    from model.document_store import (
+        DocumentStore,
+        DocumentStoreError,
+        EmbeddingClient,
+        EmbeddingClientError,
+    )
+    from model.rate_limit import TokenBucket
+
+    pdf_paths = collect_pdfs(args.pdf)
+    if not pdf_paths:
+        print("[error] No PDF files were found to ingest.")
+        return 1
+    if args.title and len(pdf_paths) > 1:
+        print("[error] --title can only be used when ingesting a single PDF.")
+        return 1
 
     store = DocumentStore(index_path=args.index) if args.index else DocumentStore()
+    rate_limiter = TokenBucket(args.tokens_per_minute) if args.tokens_per_minute else None
 
     try:
-        with EmbeddingClient() as client:
-            meta = store.ingest_pdf(args.pdf, client, title=args.title)
+        with EmbeddingClient(rate_limiter=rate_limiter) as client:
+            results = store.ingest_pdfs(
+                pdf_paths,
+                client,
+                titles=[args.title] * len(pdf_paths),
+                max_workers=args.workers,
+            )
     except (DocumentStoreError, EmbeddingClientError) as error:
         print(f"[error] {error}")
         return 1
 
-    print(
-        "[success] Ingested document '{title}' with {count} knowledge sections.".format(
-            title=meta.title, count=meta.chunk_count
+    failures = 0
+    for pdf_path, result in zip(pdf_paths, results):
+        if isinstance(result, DocumentStoreError):
+            print(f"[error] {pdf_path}: {result}")
+            failures += 1
+            continue
+
+        print(
+            "[success] Ingested document '{title}' with {count} knowledge sections.".format(
+                title=result.title, count=result.chunk_count
+            )
         )
-    )
-    return 0
+
+    return 1 if failures else 0
 
 
 def main(argv: list[str] | None = None) -> NoReturn:
@@ -61,6 +116,7 @@ def main(argv: list[str] | None = None) -> NoReturn:
 
     parser = build_parser()
     args = parser.parse_args(argv)
+    load_environment_from_file()
     exit_code = ingest(args)
     raise SystemExit(exit_code)
 
@@ -51,6 +51,50 @@ function appendMessage(role, content, timestamp = new Date()) {
   chatWindow.scrollTo({ top: chatWindow.scrollHeight, behavior: "smooth" });
 
   typesetMath(body);
+  return body;
+}
+
+function updateMessageBody(body, content) {
+  body.innerHTML = renderMessageContent(content);
+  chatWindow.scrollTo({ top: chatWindow.scrollHeight });
+}
+
+async function readChatStream(response, onDelta) {
+  // The server sends one JSON event per line: deltas, then the final history.
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let history = null;
+
+  const handleLine = (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    const event = JSON.parse(line);
+    if (event.error) {
+      throw new Error(event.error);
+    }
+    if (typeof event.delta === "string") {
+      onDelta(event.delta);
+    }
+    if (Array.isArray(event.history)) {
+      history = event.history;
+    }
+  };
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer + decoder.decode());
+
+  return history;
 }
 
 function configureMarkdown() {
@@ -202,32 +246,65 @@ chatForm.addEventListener("submit", async (event) => {
   setLoading(true);
   setStatus("Consulting Neuro AI...");
 
+  let replyBody = null;
+  let streamFinished = false;
   try {
-    const response = await fetch("/api/chat", {
+    const response = await fetch("/api/chat/stream", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ message, history: conversationHistory }),
     });
 
-    let data = {};
-    try {
-      data = await response.json();
-    } catch (parseError) {
-      // Ignore JSON parsing issues; handled below when checking response.ok.
-    }
-
     if (!response.ok) {
+      let data = {};
+      try {
+        data = await response.json();
+      } catch (parseError) {
+        // Ignore JSON parsing issues; fall back to a generic message below.
+      }
       throw new Error(data.error || `Unexpected error (status ${response.status}).`);
     }
 
-    conversationHistory = data.history || [];
+    // Render the reply as it arrives, re-rendering at most once per frame.
+    let replyText = "";
+    let renderPending = false;
+    const history = await readChatStream(response, (delta) => {
+      replyText += delta;
+      if (!replyBody) {
+        replyBody = appendMessage("assistant", "");
+      }
+      if (!renderPending) {
+        renderPending = true;
+        requestAnimationFrame(() => {
+          renderPending = false;
+          if (!streamFinished) {
+            updateMessageBody(replyBody, replyText);
+          }
+        });
+      }
+    });
+    streamFinished = true;
+
+    if (!history) {
+      // The connection closed before the final history event arrived.
+      throw new Error("Response was interrupted. Please try again.");
+    }
+    conversationHistory = history;
     const assistantReply = conversationHistory[conversationHistory.length - 1];
     if (assistantReply?.role === "assistant") {
-      appendMessage("assistant", assistantReply.content);
+      if (replyBody) {
+        updateMessageBody(replyBody, assistantReply.content);
+        typesetMath(replyBody);
+      } else {
+        appendMessage("assistant", assistantReply.content);
+      }
     }
 
     setStatus("Ready for your next idea.");
   } catch (error) {
+    streamFinished = true;
+    // A partial reply is not part of the conversation history, so drop it.
+    replyBody?.closest(".message")?.remove();
     setStatus(error.message || "Unable to reach Neuro AI.");
   } finally {
     setLoading(false);
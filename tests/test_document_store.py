@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from model.document_store import DocumentStore
+
+
+class _FakeEmbeddingClient:
+    model_name = "fake-embedding"
+
+    def embed(self, texts):
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+
+class SiblingIndexTests(unittest.TestCase):
+    def _ingest(self, store: DocumentStore, name: str) -> None:
+        chunks = ["alpha", "beta gamma"]
+        with mock.patch.object(DocumentStore, "_extract_chunks", return_value=chunks):
+            store.ingest_pdf(Path(f"{name}.pdf"), _FakeEmbeddingClient(), title=name)
+
+    def test_ingest_leaves_sibling_index_data_alone(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            sibling = DocumentStore(index_path=root / "lectures.v2.json")
+            self._ingest(sibling, "sibling")
+            sibling_files = {path.name for path in root.iterdir()}
+
+            store = DocumentStore(index_path=root / "lectures.json")
+            self._ingest(store, "first")
+            # Replacing a document writes a new generation and removes the old one.
+            self._ingest(store, "first")
+
+            self.assertTrue(sibling_files <= {path.name for path in root.iterdir()})
+            reloaded = DocumentStore(index_path=root / "lectures.v2.json")
+            self.assertEqual(len(reloaded._chunks), 2)
+
+            own_files = sorted(
+                path.name
+                for path in root.iterdir()
+                if path.name != "lectures.json" and not path.name.startswith("lectures.v2.")
+            )
+            generation = store._generation
+            self.assertEqual(own_files, [f"lectures.{generation}.i8", f"lectures.{generation}.jsonl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
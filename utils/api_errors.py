@@ -0,0 +1,51 @@
+"""Helpers for turning failed OpenAI API responses into readable error messages."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import orjson
+import requests
+
+# Error bodies are read only up to this size; gateway HTML pages can be much larger.
+_MAX_ERROR_BODY_BYTES = 4096
+_MAX_SNIPPET_CHARS = 512
+
+
+def api_error_detail(response: Optional[requests.Response]) -> str:
+    """Return a short description of why ``response`` failed.
+
+    The body is read once, and no more than a few kilobytes of it, even for
+    streamed responses. OpenAI's JSON errors yield their ``error.message``;
+    anything else (empty bodies, HTML error pages from proxies) falls back to
+    the status code and a trimmed text snippet. The response is closed afterwards.
+    """
+
+    if response is None:
+        return ""
+
+    try:
+        raw = next(response.iter_content(chunk_size=_MAX_ERROR_BODY_BYTES), b"")
+    except requests.exceptions.RequestException:  # pragma: no cover - runtime scenario
+        raw = b""
+    finally:
+        response.close()
+
+    status = f"HTTP {response.status_code}"
+    if not raw:
+        return status
+
+    if response.headers.get("Content-Type", "").startswith("application/json"):
+        try:
+            error = orjson.loads(raw).get("error")
+        except (orjson.JSONDecodeError, AttributeError):
+            error = None
+        message = error.get("message") if isinstance(error, dict) else None
+        if isinstance(message, str) and message:
+            return f"{status}: {message}"
+
+    snippet = " ".join(raw.decode("utf-8", errors="replace").split())
+    return f"{status}: {snippet[:_MAX_SNIPPET_CHARS]}"
+
+
+__all__ = ["api_error_detail"]
@@ -0,0 +1,75 @@
+"""Helpers for loading configuration from ``KEY=VALUE`` environment files."""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# One match per assignment: an identifier, ``=``, then a double-quoted, single-quoted,
+# or bare value, optionally followed by a ``#`` comment. As with dotenv, ``#`` only
+# starts a comment after whitespace, so values such as ``abc#def`` are kept whole.
+# The file is scanned as raw bytes so no decoded copy of the whole file is made;
+# only matches are decoded.
+_ENV_RE = re.compile(
+    rb"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*="""
+    rb"""(?:[ \t]*"([^"\r\n]*)"|[ \t]*'([^'\r\n]*)'"""
+    # A bare value may itself start with ``#`` unless whitespace separates it from ``=``.
+    rb"""|(?:[ \t]+(?!#)|(?![ \t])|(?=[ \t]+#))([^\r\n]*?))"""
+    rb"""(?:[ \t]+#[^\r\n]*)?[ \t]*\r?$""",
+    re.MULTILINE,
+)
+
+
+def load_environment_from_file(filename: str = "keys.env") -> None:
+    """Load environment variables from a simple ``KEY=VALUE`` file if present.
+
+    The project relies on ``OPENAI_API_KEY`` being available as an environment
+    variable. For convenience, this helper reads a ``keys.env`` file residing in
+    the project root and populates the variables without requiring an additional
+    dependency such as :mod:`python-dotenv`. Variables that are already set in the
+    environment take precedence over the file.
+
+    Relative names are looked up in the working directory first and then in the
+    project root, so scripts started from another directory still find the file.
+    """
+
+    env_path = _resolve_env_file(filename)
+    if env_path is None:
+        return
+
+    try:
+        data = env_path.read_bytes()
+    except OSError:  # pragma: no cover - file removed between the probe and the read
+        return
+
+    for match in _ENV_RE.finditer(data):
+        key = match.group(1).decode("ascii")
+        value = next(group for group in match.groups()[1:] if group is not None)
+        os.environ.setdefault(key, value.decode("utf-8"))
+
+
+def _resolve_env_file(filename: str) -> Optional[Path]:
+    """Return the first existing ``filename`` in the working directory or project root.
+
+    Only the candidate paths themselves are probed (one ``stat`` each); no
+    directory tree is walked.
+    """
+
+    path = Path(filename)
+    if path.is_absolute():
+        return path if path.is_file() else None
+
+    # An ordered de-duplication keeps the working directory ahead of the root.
+    roots = list(dict.fromkeys((Path.cwd().resolve(), PROJECT_ROOT)))
+    for root in roots:
+        candidate = root / path
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+__all__ = ["load_environment_from_file"]
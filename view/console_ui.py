@@ -8,7 +8,7 @@ that the focus stays on the MVC flow and OpenAI integration.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Final
+from typing import Final, Iterable
 
 
 class AnsiColor:
@@ -54,6 +54,29 @@ class ConsoleUI:
         header = self._colorize("Chatbot:", AnsiColor.BOT)
         print(f"{header} {message}")
 
+    def display_bot_response_stream(self, chunks: Iterable[str]) -> str:
+        """Display the chatbot's response incrementally as ``chunks`` arrive.
+
+        Returns the complete response once the stream is exhausted.
+        """
+
+        parts = []
+        try:
+            for chunk in chunks:
+                if not parts:
+                    # The request is only sent when the stream is first advanced, so
+                    # the header waits for the first chunk; an immediate failure then
+                    # prints only the error.
+                    header = self._colorize("Chatbot:", AnsiColor.BOT)
+                    print(f"{header} ", end="", flush=True)
+                parts.append(chunk)
+                print(chunk, end="", flush=True)
+        finally:
+            # Finish the line, even if the stream fails part-way through.
+            if parts:
+                print()
+        return "".join(parts).strip()
+
     def display_error(self, error_message: str) -> None:
         """Display an error message in a user-friendly format."""
 
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
+from flask.json.provider import JSONProvider
+import orjson
+from urllib3.util.retry import Retry
 
 from model.ai_engine import AIEngine, AIEngineError
+from model.response_cache import ResponseCache
 from model.document_store import (
     DocumentStore,
     DocumentStoreError,
@@ -15,10 +21,26 @@ from model.document_store import (
 )
 
 
+# Roles accepted from the client, mapped to the module's own string constants so
+# every history entry shares one role object instead of a fresh decoded copy.
+_ROLES = {role: role for role in ("user", "assistant", "system")}
+
+
+class OrjsonProvider(JSONProvider):
+    """Serve Flask's JSON requests and responses with :mod:`orjson`."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 def create_app() -> Flask:
     """Create and configure the Flask application instance."""
 
     app = Flask(__name__, template_folder="templates", static_folder="static")
+    app.json = OrjsonProvider(app)
 
     try:
         document_store = DocumentStore()
@@ -27,6 +49,48 @@ def create_app() -> Flask:
         document_store = None
 
     app.config["DOCUMENT_STORE"] = document_store
+    # One engine serves every request so its pooled keep-alive connections are
+    # reused; identical requests (same history, same lecture context) are
+    # answered from its response cache.
+    app.config["AI_ENGINE"] = AIEngine(response_cache=ResponseCache())
+    # One shared embeddings client with an in-memory query cache only; it gives up
+    # after RAG_TIMEOUT_SECONDS without retrying, and searches are skipped rather
+    # than queued when every search worker is busy.
+    rag_timeout_seconds = 3.0
+    app.config["EMBEDDING_CLIENT"] = EmbeddingClient(
+        timeout_seconds=rag_timeout_seconds,
+        cache_path=None,
+        retry=Retry(total=0, read=False, respect_retry_after_header=False),
+    )
+    app.config["RAG_TIMEOUT_SECONDS"] = rag_timeout_seconds
+    search_workers = 4
+    search_executor = ThreadPoolExecutor(
+        max_workers=search_workers, thread_name_prefix="lecture-search"
+    )
+    search_slots = threading.BoundedSemaphore(search_workers)
+
+    def start_search(store: DocumentStore, message: str) -> Optional[Future]:
+        """Submit a lecture search, or return ``None`` if every worker is busy."""
+
+        if not search_slots.acquire(blocking=False):
+            app.logger.warning("Lecture search pool is saturated; answering without context.")
+            return None
+        try:
+            search = search_executor.submit(store.search, message, app.config["EMBEDDING_CLIENT"])
+        except BaseException:
+            search_slots.release()
+            raise
+        search.add_done_callback(lambda _future: search_slots.release())
+        return search
+
+    def client_error(error: AIEngineError) -> str:
+        """Log ``error`` with its upstream detail and return the user-facing message."""
+
+        # The detail may echo request data (such as a masked API key); it stays
+        # in the server log and only the generic message reaches the browser.
+        if error.detail:
+            app.logger.warning("OpenAI API request failed: %s [%s]", error, error.detail)
+        return str(error)
 
     @app.get("/")
     def index() -> str:
@@ -34,16 +98,19 @@ def create_app() -> Flask:
 
         return render_template("index.html")
 
-    @app.post("/api/chat")
-    def chat() -> Any:
-        """Handle chat requests from the frontend."""
+    def prepare_request(
+        payload: Dict[str, Any],
+    ) -> Tuple[List[MutableMapping[str, str]], List[MutableMapping[str, str]]]:
+        """Return the visible conversation and the messages to send to the model."""
 
-        payload: Dict[str, Any] = request.get_json(silent=True) or {}
         message = (payload.get("message") or "").strip()
         history = payload.get("history") or []
 
-        if not message:
-            return jsonify({"error": "Please provide a prompt for Neuro AI."}), 400
+        # The search runs on the pool only so the request can stop waiting for it
+        # after RAG_TIMEOUT_SECONDS.
+        store = app.config.get("DOCUMENT_STORE")
+        has_content = bool(store and store.has_content())
+        search = start_search(store, message) if has_content else None
 
         conversation: List[MutableMapping[str, str]] = []
 
@@ -53,39 +120,100 @@ def create_app() -> Flask:
                     continue
                 role = item.get("role")
                 content = item.get("content")
-                if isinstance(role, str) and isinstance(content, str):
-                    conversation.append({"role": role, "content": content})
+                if isinstance(role, str) and isinstance(content, str) and role in _ROLES:
+                    conversation.append({"role": _ROLES[role], "content": content})
 
         conversation.append({"role": "user", "content": message})
 
-        contextual_messages: List[MutableMapping[str, str]] = []
-        store = app.config.get("DOCUMENT_STORE")
-        if store and store.has_content():
+        # Keep everything that is identical between turns (system prompt, earlier
+        # history) at the front of the request and put the per-question lecture
+        # excerpts right before the new user message, so the prompt prefix stays
+        # stable and can be served from the API's prompt cache.
+        messages: List[MutableMapping[str, str]] = conversation[:-1]
+        if has_content:
+            messages.insert(0, {"role": "system", "content": store.build_system_prompt()})
+        if search is not None:
             try:
-                with EmbeddingClient() as embedder:
-                    search_results = store.search(message, embedder)
+                search_results = search.result(timeout=app.config["RAG_TIMEOUT_SECONDS"])
+            except FutureTimeoutError:  # pragma: no cover - runtime scenario
+                search.cancel()
+                app.logger.warning("Lecture search timed out; answering without lecture context.")
             except EmbeddingClientError as error:  # pragma: no cover - runtime scenario
                 app.logger.warning("Failed to retrieve lecture context: %s", error)
             else:
                 if search_results:
                     top_chunks = [chunk for _score, chunk in search_results]
-                    contextual_messages.append(
+                    messages.append(
                         {
                             "role": "system",
-                            "content": store.build_system_prompt(top_chunks),
+                            "content": store.build_context_prompt(top_chunks),
                         }
                     )
+        messages.append(conversation[-1])
+        return conversation, messages
+
+    @app.post("/api/chat")
+    def chat() -> Any:
+        """Handle chat requests from the frontend."""
+
+        payload: Dict[str, Any] = request.get_json(silent=True) or {}
+        if not (payload.get("message") or "").strip():
+            return jsonify({"error": "Please provide a prompt for Neuro AI."}), 400
+
+        conversation, messages = prepare_request(payload)
 
         try:
-            with AIEngine() as engine:
-                response_text = engine.generate_response(contextual_messages + conversation)
+            response_text = app.config["AI_ENGINE"].generate_response(messages)
         except AIEngineError as error:
-            return jsonify({"error": str(error)}), 500
+            return jsonify({"error": client_error(error)}), 500
 
         conversation.append({"role": "assistant", "content": response_text})
 
         return jsonify({"response": response_text, "history": conversation})
 
+    @app.post("/api/chat/stream")
+    def chat_stream() -> Any:
+        """Stream the reply as newline-delimited JSON events.
+
+        Each line is ``{"delta": ...}`` while the model is writing, followed by a
+        final ``{"history": ...}`` line (or ``{"error": ...}`` if the stream breaks).
+        """
+
+        payload: Dict[str, Any] = request.get_json(silent=True) or {}
+        if not (payload.get("message") or "").strip():
+            return jsonify({"error": "Please provide a prompt for Neuro AI."}), 400
+
+        conversation, messages = prepare_request(payload)
+
+        deltas = app.config["AI_ENGINE"].stream_response(messages)
+        # Pull the first delta up front so request failures still map to an HTTP error.
+        try:
+            first = next(deltas, "")
+        except AIEngineError as error:
+            return jsonify({"error": client_error(error)}), 500
+
+        def generate() -> Iterator[bytes]:
+            parts = [first]
+            try:
+                if first:
+                    yield orjson.dumps({"delta": first}, option=orjson.OPT_APPEND_NEWLINE)
+                for delta in deltas:
+                    parts.append(delta)
+                    yield orjson.dumps({"delta": delta}, option=orjson.OPT_APPEND_NEWLINE)
+            except AIEngineError as error:  # pragma: no cover - runtime scenario
+                yield orjson.dumps(
+                    {"error": client_error(error)}, option=orjson.OPT_APPEND_NEWLINE
+                )
+                return
+            finally:
+                # Hand the connection back to the shared pool even if the client left.
+                deltas.close()
+
+            conversation.append({"role": "assistant", "content": "".join(parts).strip()})
+            yield orjson.dumps({"history": conversation}, option=orjson.OPT_APPEND_NEWLINE)
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
     return app
 
 